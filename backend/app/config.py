@@ -1,6 +1,6 @@
 """App configuration via environment variables."""
 
-from pydantic_settings import BaseSettings
+from pydantic_settings import BaseSettings, SettingsConfigDict
 from functools import lru_cache
 from typing import Optional
 
@@ -12,6 +12,7 @@ class Settings(BaseSettings):
     debug: bool = True
     api_version: str = "v1"
     database_url: str = "sqlite:///./notes.db"
+    redis_url: Optional[str] = None
     openai_api_key: Optional[str] = None
     groq_api_key: Optional[str] = None
     ai_provider: str = "openai"
@@ -19,15 +20,16 @@ class Settings(BaseSettings):
     max_text_length: int = 50000
     max_pdf_size_mb: int = 10
     chunk_size: int = 3000
+    pdf_backend: Optional[str] = None
     cors_origins: list[str] = ["*"]
     default_summary_length: str = "medium"
     
-    class Config:
-        env_file = ".env"
-        env_file_encoding = "utf-8"
-        case_sensitive = False
+    model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf-8", case_sensitive=False)
 
 
 @lru_cache()
 def get_settings() -> Settings:
     return Settings()
+
+
+settings = get_settings()
@@ -1,3 +1,3 @@
-from .connection import get_db, engine, Base, init_db
+from .connection import get_db, engine, Base, init_db, SessionLocal, sqlite_search_ready, guest_id_default_ready
 
-__all__ = ["get_db", "engine", "Base", "init_db"]
+__all__ = ["get_db", "engine", "Base", "init_db", "SessionLocal", "sqlite_search_ready", "guest_id_default_ready"]
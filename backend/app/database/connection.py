@@ -1,40 +1,149 @@
 """Database connection and session management."""
 
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, declarative_base
-from sqlalchemy.pool import StaticPool
-from ..config import get_settings
+import logging
+
+from sqlalchemy import event
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from sqlalchemy.orm import declarative_base
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+}
+
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA cache_size=-64000",
+)
+
+SQLITE_SEARCH_DDL = (
+    "CREATE VIRTUAL TABLE notes_fts USING fts5(title, content='notes', content_rowid='id', tokenize='trigram')",
+    "CREATE TRIGGER notes_fts_ai AFTER INSERT ON notes BEGIN "
+    "INSERT INTO notes_fts(rowid, title) VALUES (new.id, new.title); END",
+    "CREATE TRIGGER notes_fts_ad AFTER DELETE ON notes BEGIN "
+    "INSERT INTO notes_fts(notes_fts, rowid, title) VALUES ('delete', old.id, old.title); END",
+    "CREATE TRIGGER notes_fts_au AFTER UPDATE OF title ON notes BEGIN "
+    "INSERT INTO notes_fts(notes_fts, rowid, title) VALUES ('delete', old.id, old.title); "
+    "INSERT INTO notes_fts(rowid, title) VALUES (new.id, new.title); END",
+    "INSERT INTO notes_fts(notes_fts) VALUES ('rebuild')",
+)
+
+# Trigram GIN index lets PostgreSQL answer ILIKE '%term%' title searches without a sequential scan
+POSTGRES_SEARCH_DDL = (
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX IF NOT EXISTS ix_notes_title_trgm ON notes USING gin (title gin_trgm_ops)",
+)
+
+
+# Set by init_db once the notes_fts table is known to exist
+_sqlite_search_ready = False
+# Set by init_db once PostgreSQL fills users.guest_id from a column default
+_guest_id_default_ready = False
+
+
+def sqlite_search_ready() -> bool:
+    """Whether SQLite title searches can use the notes_fts trigram index."""
+    return _sqlite_search_ready
+
+
+def guest_id_default_ready() -> bool:
+    """Whether the database generates guest ids itself."""
+    return _guest_id_default_ready
+
+
+def _async_database_url(database_url: str) -> str:
+    """Map a plain database URL onto its async driver."""
+    url = make_url(database_url)
+    drivername = ASYNC_DRIVERS.get(url.drivername, url.drivername)
+    return url.set(drivername=drivername).render_as_string(hide_password=False)
 
-settings = get_settings()
 
 if settings.database_url.startswith("sqlite"):
-    engine = create_engine(
-        settings.database_url,
-        connect_args={"check_same_thread": False},
-        poolclass=StaticPool,
+    engine = create_async_engine(
+        _async_database_url(settings.database_url),
+        connect_args={"check_same_thread": False, "timeout": 30},
+        # SQLAlchemy < 2.0.38 defaults aiosqlite file databases to NullPool, which rejects the sizing arguments
+        poolclass=AsyncAdaptedQueuePool,
+        pool_size=10,
+        max_overflow=20,
+        pool_use_lifo=True,
+        pool_pre_ping=True,
         echo=settings.debug
     )
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        """WAL lets readers proceed while a writer holds the lock."""
+        cursor = dbapi_connection.cursor()
+        for pragma in SQLITE_PRAGMAS:
+            cursor.execute(pragma)
+        cursor.close()
 else:
-    engine = create_engine(
-        settings.database_url,
+    engine = create_async_engine(
+        _async_database_url(settings.database_url),
         pool_size=5,
         max_overflow=10,
         pool_pre_ping=True,
         echo=settings.debug
     )
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Attributes must stay loaded after commit: lazy refreshes cannot run outside the event loop.
+SessionLocal = async_sessionmaker(engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
 Base = declarative_base()
 
 
-def get_db():
-    db = SessionLocal()
-    try:
+async def get_db():
+    async with SessionLocal() as db:
         yield db
-    finally:
-        db.close()
 
 
-def init_db():
+def _create_schema(conn):
+    global _sqlite_search_ready, _guest_id_default_ready
+    Base.metadata.create_all(conn)
+    # create_all skips existing tables, so add indexes introduced since they were created
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(conn, checkfirst=True)
+    if conn.dialect.name == "sqlite":
+        exists = conn.exec_driver_sql("SELECT 1 FROM sqlite_master WHERE name = 'notes_fts'").first()
+        if not exists:
+            try:
+                with conn.begin_nested():
+                    for statement in SQLITE_SEARCH_DDL:
+                        conn.exec_driver_sql(statement)
+                exists = True
+            except DBAPIError as e:
+                # The trigram tokenizer needs SQLite 3.34+; search falls back to an unindexed LIKE
+                logger.warning("Skipping FTS5 title search table: %s", e)
+        _sqlite_search_ready = bool(exists)
+    elif conn.dialect.name == "postgresql":
+        try:
+            with conn.begin_nested():
+                conn.exec_driver_sql("ALTER TABLE users ALTER COLUMN guest_id SET DEFAULT gen_random_uuid()::text")
+            _guest_id_default_ready = True
+        except DBAPIError as e:
+            # Needs table ownership and PostgreSQL 13+ (or pgcrypto); guest ids are then generated in Python
+            logger.warning("Skipping guest_id column default: %s", e)
+        try:
+            with conn.begin_nested():
+                for statement in POSTGRES_SEARCH_DDL:
+                    conn.exec_driver_sql(statement)
+        except DBAPIError as e:
+            # CREATE EXTENSION needs elevated privileges; search still works, just unindexed
+            logger.warning("Skipping trigram title index: %s", e)
+
+
+async def init_db():
     from ..models import user, note, summary
-    Base.metadata.create_all(bind=engine)
+    async with engine.begin() as conn:
+        await conn.run_sync(_create_schema)
@@ -1,48 +1,66 @@
 """AI Note Summarizer - FastAPI Backend"""
 
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
+import logging
 
-from .config import get_settings
+from .config import settings
 from .database import init_db
 from .routes import notes_router, summaries_router, users_router, health_router
 
 import asyncio
-from .services.background_summarizer import warmup_model
+from .services.background_summarizer import warmup_model, get_redis, close_redis, run_job_cleanup
+from .services.summarizer import close_http_client
+
+logger = logging.getLogger(__name__)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    print("🚀 Starting AI Note Summarizer API...")
-    init_db()
-    print("✅ Database initialized")
+    # Configure only the app's loggers: root handlers would duplicate SQLAlchemy echo and enable library debug output
+    app_logger = logging.getLogger("app")
+    if not app_logger.handlers:
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+        app_logger.addHandler(handler)
+        app_logger.propagate = False
+    app_logger.setLevel(logging.DEBUG if settings.debug else logging.INFO)
+    logger.info("Starting AI Note Summarizer API...")
+    await init_db()
+    logger.info("Database initialized")
+
+    cleanup_task = None
+    if get_redis() is None:
+        cleanup_task = asyncio.create_task(run_job_cleanup())
+    else:
+        logger.info("Using Redis job store")
 
-    settings = get_settings()
     if settings.ai_provider == "groq" or settings.groq_api_key:
-        print("✅ Using Groq API (FREE Llama 3.1 70B - GPT-level quality!)")
+        logger.info("Using Groq API (FREE Llama 3.1 70B - GPT-level quality!)")
         if not settings.groq_api_key:
-            print("⚠️ GROQ_API_KEY not set! Get one FREE at https://console.groq.com/keys")
+            logger.warning("GROQ_API_KEY not set! Get one FREE at https://console.groq.com/keys")
     elif settings.ai_provider == "huggingface":
-        try:
-            loop = asyncio.get_running_loop()
-            print("⏳ Warming up HuggingFace summarizer...")
-            await loop.run_in_executor(None, warmup_model)
-            print("✅ HuggingFace model ready")
-        except Exception as e:
-            print(f"⚠️ HuggingFace warmup failed: {e}")
+        logger.info("Warming up HuggingFace summarizer in the background...")
+
+    # Warm up off the event loop so startup does not wait on model loading
+    asyncio.get_running_loop().run_in_executor(None, warmup_model)
     
     yield
-    print("👋 Shutting down AI Note Summarizer API...")
-
+    logger.info("Shutting down AI Note Summarizer API...")
+    if cleanup_task:
+        cleanup_task.cancel()
+    await close_redis()
+    await close_http_client()
 
-settings = get_settings()
 
 app = FastAPI(
     title=settings.app_name,
     description="AI-powered note summarization API",
     version="1.0.0",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 app.add_middleware(
@@ -1,8 +1,8 @@
 """Note model for user notes."""
 
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Enum
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Enum, Index
 from sqlalchemy.orm import relationship
-from sqlalchemy.sql import func
+from sqlalchemy.sql import func, table, column
 import enum
 from ..database.connection import Base
 
@@ -29,3 +29,13 @@ class Note(Base):
     
     owner = relationship("User", back_populates="notes")
     summaries = relationship("Summary", back_populates="note", cascade="all, delete-orphan")
+    
+    __table_args__ = (
+        Index("ix_notes_user_created", "user_id", created_at.desc()),
+    )
+    # Fetch created_at/updated_at via RETURNING during the flush instead of a refresh SELECT
+    __mapper_args__ = {"eager_defaults": True}
+
+
+# SQLite FTS5 trigram index over note titles, kept in sync by triggers (see database.connection)
+notes_fts = table("notes_fts", column("rowid"), column("title"))
@@ -1,6 +1,6 @@
 """Summary model for AI-generated summaries."""
 
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Float
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Float, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from ..database.connection import Base
@@ -22,4 +22,8 @@ class Summary(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     
     note = relationship("Note", back_populates="summaries")
+    
+    __table_args__ = (
+        Index("ix_summaries_note_type_len", "note_id", "summary_type", "summary_length"),
+    )
 
@@ -1,6 +1,6 @@
 """User model for guest and registered users."""
 
-from sqlalchemy import Column, Integer, String, DateTime, Boolean
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, FetchedValue
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from ..database.connection import Base
@@ -10,7 +10,7 @@ class User(Base):
     __tablename__ = "users"
     
     id = Column(Integer, primary_key=True, index=True)
-    guest_id = Column(String(36), unique=True, index=True, nullable=True)
+    guest_id = Column(String(36), unique=True, index=True, nullable=True, server_default=FetchedValue())  # gen_random_uuid() on PostgreSQL
     email = Column(String(255), unique=True, index=True, nullable=True)
     display_name = Column(String(100), default="Guest User")
     is_guest = Column(Boolean, default=True)
@@ -18,3 +18,5 @@ class User(Base):
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
     notes = relationship("Note", back_populates="owner", cascade="all, delete-orphan")
+    
+    __mapper_args__ = {"eager_defaults": True}
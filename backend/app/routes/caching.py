@@ -0,0 +1,18 @@
+"""HTTP caching helpers for read endpoints."""
+
+from fastapi import Request
+import hashlib
+
+
+def weak_etag(*parts) -> str:
+    """Weak validator over the fields that determine a response body."""
+    digest = hashlib.blake2b(repr(parts).encode("utf-8"), digest_size=12).hexdigest()
+    return f'W/"{digest}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    tags = [tag.strip() for tag in header.split(",")]
+    return "*" in tags or etag in tags
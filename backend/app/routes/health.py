@@ -1,34 +1,32 @@
 """Health check routes."""
 
 from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import text
 from ..database import get_db
-from ..config import get_settings
+from ..config import settings
 
 router = APIRouter(prefix="/health", tags=["Health"])
 
 
 @router.get("")
 async def health_check():
-    settings = get_settings()
     return {"status": "healthy", "app_name": settings.app_name, "version": "1.0.0"}
 
 
 @router.get("/db")
-async def database_health(db: Session = Depends(get_db)):
+async def database_health(db: AsyncSession = Depends(get_db)):
     try:
-        db.execute(text("SELECT 1"))
+        await db.execute(text("SELECT 1"))
         return {"status": "healthy", "database": "connected"}
     except Exception as e:
         return {"status": "unhealthy", "database": "disconnected", "error": str(e)}
 
 
 @router.get("/ready")
-async def readiness_check(db: Session = Depends(get_db)):
-    settings = get_settings()
+async def readiness_check(db: AsyncSession = Depends(get_db)):
     try:
-        db.execute(text("SELECT 1"))
+        await db.execute(text("SELECT 1"))
         db_status = "ready"
     except Exception:
         db_status = "not_ready"
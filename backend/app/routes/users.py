@@ -1,7 +1,7 @@
 """User API routes."""
 
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional
 
 from ..database import get_db
@@ -12,23 +12,23 @@ router = APIRouter(prefix="/users", tags=["Users"])
 
 
 @router.post("", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
-async def create_user(user_data: Optional[UserCreate] = None, db: Session = Depends(get_db)):
+async def create_user(user_data: Optional[UserCreate] = None, db: AsyncSession = Depends(get_db)):
     if user_data is None:
         user_data = UserCreate(is_guest=True)
-    return UserService(db).create_user(user_data)
+    return await UserService(db).create_user(user_data)
 
 
 @router.get("/guest/{guest_id}", response_model=UserResponse)
-async def get_user_by_guest_id(guest_id: str, db: Session = Depends(get_db)):
-    user = UserService(db).get_by_guest_id(guest_id)
+async def get_user_by_guest_id(guest_id: str, db: AsyncSession = Depends(get_db)):
+    user = await UserService(db).get_by_guest_id(guest_id)
     if not user:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
     return user
 
 
 @router.get("/{user_id}", response_model=UserResponse)
-async def get_user(user_id: int, db: Session = Depends(get_db)):
-    user = UserService(db).get_by_id(user_id)
+async def get_user(user_id: int, db: AsyncSession = Depends(get_db)):
+    user = await UserService(db).get_by_id(user_id)
     if not user:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
     return user
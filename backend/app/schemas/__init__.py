@@ -1,9 +1,9 @@
 from .user import UserCreate, UserResponse
-from .note import NoteCreate, NoteUpdate, NoteResponse, NoteListResponse
+from .note import NoteCreate, NoteUpdate, NoteResponse, NoteListResponse, NoteListAdapter
 from .summary import SummaryResponse, SummaryRequest
 
 __all__ = [
     "UserCreate", "UserResponse",
-    "NoteCreate", "NoteUpdate", "NoteResponse", "NoteListResponse",
+    "NoteCreate", "NoteUpdate", "NoteResponse", "NoteListResponse", "NoteListAdapter",
     "SummaryResponse", "SummaryRequest"
 ]
@@ -1,8 +1,8 @@
 """Note schemas for API validation."""
 
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter, field_validator
 from datetime import datetime
-from typing import Optional
+from typing import Optional, List
 from enum import Enum
 
 
@@ -20,9 +20,10 @@ class NoteCreate(BaseModel):
     @field_validator("content")
     @classmethod
     def validate_content(cls, v: str) -> str:
-        if not v.strip():
+        stripped = v.strip()
+        if not stripped:
             raise ValueError("Content cannot be empty")
-        return v.strip()
+        return stripped
 
 
 class NoteUpdate(BaseModel):
@@ -32,9 +33,12 @@ class NoteUpdate(BaseModel):
     @field_validator("content")
     @classmethod
     def validate_content(cls, v: Optional[str]) -> Optional[str]:
-        if v is not None and not v.strip():
+        if v is None:
+            return v
+        stripped = v.strip()
+        if not stripped:
             raise ValueError("Content cannot be empty")
-        return v.strip() if v else v
+        return stripped
 
 
 class NoteResponse(BaseModel):
@@ -49,8 +53,7 @@ class NoteResponse(BaseModel):
     user_id: Optional[int] = None
     summary_count: int = 0
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class NoteListResponse(BaseModel):
@@ -62,5 +65,8 @@ class NoteListResponse(BaseModel):
     summary_count: int = 0
     content_preview: str = ""
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
+
+
+# Validates and serializes whole note pages in single pydantic-core passes
+NoteListAdapter = TypeAdapter(List[NoteListResponse])
@@ -1,6 +1,6 @@
 """Summary schemas for API validation."""
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from datetime import datetime
 from typing import Optional
 from enum import Enum
@@ -48,6 +48,5 @@ class SummaryResponse(BaseModel):
     compression_ratio: Optional[float] = None
     created_at: datetime
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
@@ -1,6 +1,6 @@
 """User schemas for API validation."""
 
-from pydantic import BaseModel, Field, EmailStr
+from pydantic import BaseModel, ConfigDict, Field, EmailStr
 from datetime import datetime
 from typing import Optional
 
@@ -19,5 +19,4 @@ class UserResponse(BaseModel):
     is_guest: bool
     created_at: datetime
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
@@ -1,13 +1,28 @@
 """Background job queue for async summarization."""
 
 import asyncio
+import json
+import logging
+import time
 import uuid
-from typing import Dict, Any, Optional
-from dataclasses import dataclass, field
+from typing import Dict, Any, Optional, Set, AsyncIterator, Tuple
+from dataclasses import dataclass, field, asdict
 from datetime import datetime
 from enum import Enum
+from functools import lru_cache
 
-from .summarizer import SummarizerFactory
+from sqlalchemy import insert
+
+from ..config import settings
+from ..database import SessionLocal
+from ..models.summary import Summary
+from .summarizer import SummarizerFactory, HuggingFaceSummarizer
+
+logger = logging.getLogger(__name__)
+
+JOB_TTL_SECONDS = 3600
+CLEANUP_INTERVAL_SECONDS = 300
+KEEPALIVE_SECONDS = 15
 
 
 class JobStatus(str, Enum):
@@ -17,61 +32,242 @@ class JobStatus(str, Enum):
     FAILED = "failed"
 
 
-@dataclass
+@dataclass(slots=True)
 class SummaryJob:
     job_id: str
     note_id: int
     status: JobStatus = JobStatus.PENDING
     progress: int = 0
     result: Optional[Dict[str, Any]] = None
+    summary: Optional[Dict[str, Any]] = None  # persisted summary record, set on completion
     error: Optional[str] = None
-    created_at: datetime = field(default_factory=datetime.now)
-    completed_at: Optional[datetime] = None
+    created_at: datetime = field(default_factory=datetime.now)  # wall clock, for display
+    # Monotonic timestamps from the process running the job, for durations and expiry
+    created_monotonic: float = field(default_factory=time.monotonic)
+    completed_monotonic: Optional[float] = None
     # Request parameters for creating summary record
     line_count: Optional[int] = None
     summary_type: str = "summary"
     summary_style: str = "best_fit"
 
 
+# Process-local fallback when REDIS_URL is not configured
 _jobs: Dict[str, SummaryJob] = {}
+_jobs_lock = asyncio.Lock()
+_subscribers: Dict[str, Set[asyncio.Queue]] = {}
+# Single-flight map: identical requests join the running job instead of starting another
+_inflight: Dict[str, str] = {}
+
+
+@lru_cache(maxsize=1)
+def get_redis():
+    """Shared Redis client, or None to keep jobs in this process."""
+    if not settings.redis_url:
+        return None
+    import redis.asyncio as redis
+    return redis.from_url(settings.redis_url, decode_responses=True)
+
+
+async def close_redis():
+    client = get_redis()
+    if client is not None:
+        await client.aclose()
+        get_redis.cache_clear()
+
+
+def _serialize_job(job: SummaryJob) -> str:
+    data = asdict(job)
+    data["status"] = job.status.value
+    data["created_at"] = job.created_at.isoformat()
+    return json.dumps(data)
+
+
+def _deserialize_job(payload: str) -> SummaryJob:
+    data = json.loads(payload)
+    data["status"] = JobStatus(data["status"])
+    data["created_at"] = datetime.fromisoformat(data["created_at"])
+    return SummaryJob(**data)
+
+
+async def save_job(job: SummaryJob):
+    """Store the job and notify anyone watching it."""
+    client = get_redis()
+    if client is not None:
+        payload = _serialize_job(job)
+        await client.setex(f"job:{job.job_id}", JOB_TTL_SECONDS, payload)
+        await client.publish(f"job:{job.job_id}", payload)
+        return
+    async with _jobs_lock:
+        _jobs[job.job_id] = job
+    for queue in _subscribers.get(job.job_id, ()):
+        queue.put_nowait(job)
+
+
+def _is_finished(job: SummaryJob) -> bool:
+    return job.status in (JobStatus.COMPLETED, JobStatus.FAILED)
+
+
+async def watch_job(job_id: str) -> AsyncIterator[Optional[SummaryJob]]:
+    """Yield the job now and after every update, until it completes or fails.
+    
+    Yields None as a keepalive when no update arrives for KEEPALIVE_SECONDS; the job
+    is re-read at that point so a missed update or an expired job still ends the stream.
+    """
+    client = get_redis()
+    if client is not None:
+        pubsub = client.pubsub()
+        await pubsub.subscribe(f"job:{job_id}")
+        try:
+            # Read after subscribing so no update can slip in between
+            job = await get_job(job_id)
+            while job is not None:
+                yield job
+                if _is_finished(job):
+                    return
+                while True:
+                    message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=KEEPALIVE_SECONDS)
+                    if message is not None:
+                        job = _deserialize_job(message["data"])
+                        break
+                    job = await get_job(job_id)
+                    if job is None or _is_finished(job):
+                        break
+                    yield None
+        finally:
+            await pubsub.aclose()
+        return
+    
+    queue: asyncio.Queue = asyncio.Queue()
+    _subscribers.setdefault(job_id, set()).add(queue)
+    try:
+        job = await get_job(job_id)
+        while job is not None:
+            yield job
+            if _is_finished(job):
+                return
+            while True:
+                try:
+                    job = await asyncio.wait_for(queue.get(), KEEPALIVE_SECONDS)
+                    break
+                except asyncio.TimeoutError:
+                    job = await get_job(job_id)
+                    if job is None or _is_finished(job):
+                        break
+                    yield None
+    finally:
+        watchers = _subscribers.get(job_id)
+        if watchers is not None:
+            watchers.discard(queue)
+            if not watchers:
+                del _subscribers[job_id]
 
 
 def warmup_model():
-    """Pre-load HuggingFace model for faster first inference."""
+    """Instantiate the active summarizer and pre-load local model weights."""
     try:
-        from transformers import pipeline
-        pipeline("summarization", model="facebook/bart-large-cnn")
-    except Exception:
-        pass
+        summarizer = SummarizerFactory.get_summarizer()
+        if isinstance(summarizer, HuggingFaceSummarizer):
+            summarizer._get_pipeline()
+            logger.info("HuggingFace model ready")
+    except Exception as e:
+        logger.warning("Summarizer warmup failed: %s", e)
+
 
+def _inflight_key(note_id: int, line_count: Optional[int], summary_type: str, summary_style: str) -> str:
+    return f"inflight:{note_id}:{line_count or 'auto'}:{summary_type}:{summary_style}"
 
-def create_summary_job(
+
+async def create_summary_job(
     note_id: int, 
     line_count: Optional[int] = None,
     summary_type: str = "summary",
     summary_style: str = "best_fit"
-) -> SummaryJob:
-    job_id = str(uuid.uuid4())
+) -> Tuple[SummaryJob, bool]:
+    """Return the job for these parameters and whether it was newly created."""
+    key = _inflight_key(note_id, line_count, summary_type, summary_style)
     job = SummaryJob(
-        job_id=job_id, 
+        job_id=str(uuid.uuid4()), 
         note_id=note_id,
         line_count=line_count,
         summary_type=summary_type,
         summary_style=summary_style
     )
-    _jobs[job_id] = job
-    return job
+    
+    client = get_redis()
+    if client is not None:
+        if not await client.set(key, job.job_id, nx=True, ex=JOB_TTL_SECONDS):
+            existing = await get_job(await client.get(key) or "")
+            if existing:
+                return existing, False
+            await client.set(key, job.job_id, ex=JOB_TTL_SECONDS)
+        await save_job(job)
+        return job, True
+    
+    async with _jobs_lock:
+        existing = _jobs.get(_inflight.get(key, ""))
+        if existing:
+            return existing, False
+        _inflight[key] = job.job_id
+        _jobs[job.job_id] = job
+    return job, True
+
+
+async def _release_inflight(job: SummaryJob):
+    key = _inflight_key(job.note_id, job.line_count, job.summary_type, job.summary_style)
+    client = get_redis()
+    if client is not None:
+        if await client.get(key) == job.job_id:
+            await client.delete(key)
+        return
+    async with _jobs_lock:
+        if _inflight.get(key) == job.job_id:
+            del _inflight[key]
+
+
+async def get_job(job_id: str) -> Optional[SummaryJob]:
+    client = get_redis()
+    if client is not None:
+        payload = await client.get(f"job:{job_id}")
+        return _deserialize_job(payload) if payload else None
+    async with _jobs_lock:
+        return _jobs.get(job_id)
+
+
+async def cleanup_old_jobs(max_age_seconds: int = JOB_TTL_SECONDS):
+    now = time.monotonic()
+    async with _jobs_lock:
+        to_remove = [job_id for job_id, job in _jobs.items() if now - job.created_monotonic > max_age_seconds]
+        for job_id in to_remove:
+            del _jobs[job_id]
 
 
-def get_job(job_id: str) -> Optional[SummaryJob]:
-    return _jobs.get(job_id)
+async def run_job_cleanup(interval_seconds: int = CLEANUP_INTERVAL_SECONDS):
+    """Periodically evict stale process-local jobs (Redis expires its own)."""
+    while True:
+        await asyncio.sleep(interval_seconds)
+        await cleanup_old_jobs()
 
 
-def cleanup_old_jobs(max_age_seconds: int = 3600):
-    now = datetime.now()
-    to_remove = [job_id for job_id, job in _jobs.items() if (now - job.created_at).total_seconds() > max_age_seconds]
-    for job_id in to_remove:
-        del _jobs[job_id]
+async def _persist_summary(job: SummaryJob) -> Dict[str, Any]:
+    """Insert the job's summary once and return it in API response shape."""
+    values = {
+        "note_id": job.note_id,
+        "content": job.result["summary"],
+        "summary_type": job.summary_type,
+        "summary_length": str(job.line_count) if job.line_count else "auto",
+        "ai_provider": job.result["provider"],
+        "ai_model": job.result["model"],
+        "generation_time_ms": int((job.completed_monotonic - job.created_monotonic) * 1000),
+        "token_count": job.result.get("tokens"),
+        "compression_ratio": 0.0
+    }
+    async with SessionLocal() as db:
+        # RETURNING hands back the generated columns, so no refresh SELECT is needed
+        row = (await db.execute(insert(Summary).values(**values).returning(Summary.id, Summary.created_at))).one()
+        await db.commit()
+    
+    values.pop("note_id")
+    return {"id": row.id, **values, "summary_style": job.summary_style, "created_at": row.created_at.isoformat()}
 
 
 async def process_summary_job(
@@ -84,27 +280,27 @@ async def process_summary_job(
     """Process a summary job asynchronously."""
     job.status = JobStatus.PROCESSING
     job.progress = 10
+    await save_job(job)
     try:
-        print(f"📝 Getting summarizer...")
         summarizer = SummarizerFactory.get_summarizer()
-        print(f"🤖 Using summarizer: {type(summarizer).__name__}")
+        logger.debug("Job %s using summarizer %s", job.job_id, type(summarizer).__name__)
         result = await summarizer.summarize(
             text=text, 
             line_count=line_count, 
             summary_type=summary_type,
             style=summary_style
         )
-        print(f"✅ Summary generated successfully!")
         job.result = result
+        job.completed_monotonic = time.monotonic()
+        # Persist here, off every request path, so status reads never write
+        job.summary = await _persist_summary(job)
         job.status = JobStatus.COMPLETED
         job.progress = 100
-        job.completed_at = datetime.now()
-        print(f"✅ Job {job.job_id} completed successfully")
+        await save_job(job)
+        logger.debug("Job %s completed", job.job_id)
     except Exception as e:
-        import traceback
         error_msg = str(e)
-        print(f"❌ Job {job.job_id} failed: {error_msg}")
-        print(traceback.format_exc())
+        logger.exception("Job %s failed", job.job_id)
         
         # Provide user-friendly error messages
         if "rate_limit" in error_msg.lower() or "429" in error_msg:
@@ -115,5 +311,8 @@ async def process_summary_job(
             job.error = error_msg
         
         job.status = JobStatus.FAILED
-        job.completed_at = datetime.now()
+        job.completed_monotonic = time.monotonic()
+        await save_job(job)
+    finally:
+        await _release_inflight(job)
 
@@ -1,22 +1,50 @@
 """Note service for business logic."""
 
-from sqlalchemy.orm import Session
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import defer
 from typing import Optional, List
 import hashlib
 
-from ..models.note import Note, NoteSourceType
+try:
+    import blake3
+except ImportError:
+    blake3 = None
+
+from ..database import sqlite_search_ready
+from ..models.note import Note, NoteSourceType, notes_fts
 from ..models.summary import Summary
-from ..schemas.note import NoteCreate, NoteUpdate, NoteListResponse
+from ..schemas.note import NoteCreate, NoteUpdate, NoteListResponse, NoteListAdapter
+
+HASH_CHUNK_CHARS = 65536
 
 
 class NoteService:
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.db = db
     
     def _compute_hash(self, content: str) -> str:
-        return hashlib.sha256(content.encode('utf-8')).hexdigest()
+        # Only compared for equality, so the SIMD BLAKE3 build is used when installed
+        h = blake3.blake3() if blake3 is not None else hashlib.blake2b(digest_size=32)
+        # Encode in slices so large notes never hold a second full-size copy
+        for i in range(0, len(content), HASH_CHUNK_CHARS):
+            h.update(content[i:i + HASH_CHUNK_CHARS].encode('utf-8'))
+        return h.hexdigest()
+    
+    async def _get_with_count(self, note_id: int) -> Optional[Note]:
+        """Load a note and its summary count in one round-trip."""
+        row = (await self.db.execute(
+            select(Note, func.count(Summary.id))
+            .outerjoin(Summary, Summary.note_id == Note.id)
+            .where(Note.id == note_id)
+            .group_by(Note.id)
+        )).first()
+        if not row:
+            return None
+        note, note.summary_count = row
+        return note
     
-    def create_note(self, data: NoteCreate, user_id: Optional[int] = None, original_filename: Optional[str] = None) -> Note:
+    async def create_note(self, data: NoteCreate, user_id: Optional[int] = None, original_filename: Optional[str] = None) -> Note:
         note = Note(
             title=data.title,
             content=data.content,
@@ -24,44 +52,54 @@ class NoteService:
             user_id=user_id,
             original_filename=original_filename,
             content_hash=self._compute_hash(data.content),
-            char_count=len(data.content)
+            char_count=len(data.content),
+            updated_at=None  # set explicitly so the flush has nothing left to post-fetch
         )
         self.db.add(note)
-        self.db.commit()
-        self.db.refresh(note)
+        await self.db.commit()
         return note
     
-    def get_note(self, note_id: int) -> Optional[Note]:
-        note = self.db.query(Note).filter(Note.id == note_id).first()
-        if note:
-            note.summary_count = self.db.query(Summary).filter(Summary.note_id == note_id).count()
-        return note
+    async def get_note(self, note_id: int) -> Optional[Note]:
+        return await self._get_with_count(note_id)
     
-    def list_notes(self, user_id: Optional[int] = None, skip: int = 0, limit: int = 20, search: Optional[str] = None) -> List[NoteListResponse]:
-        query = self.db.query(Note)
+    async def list_notes(self, user_id: Optional[int] = None, skip: int = 0, limit: int = 20, search: Optional[str] = None) -> List[NoteListResponse]:
+        # One aggregated query: counts and a 201-char preview (to detect truncation) come from the DB
+        query = select(
+            Note.id,
+            Note.title,
+            Note.source_type,
+            Note.char_count,
+            Note.created_at,
+            func.count(Summary.id).label("summary_count"),
+            func.substr(Note.content, 1, 201).label("preview"),
+        ).outerjoin(Summary, Summary.note_id == Note.id).group_by(Note.id)
         if user_id is not None:
-            query = query.filter(Note.user_id == user_id)
+            query = query.where(Note.user_id == user_id)
         if search:
-            query = query.filter(Note.title.ilike(f"%{search}%"))
+            if self.db.bind.dialect.name == "sqlite" and sqlite_search_ready():
+                # Trigram FTS5 answers case-insensitive substring LIKE from its index
+                matches = select(notes_fts.c.rowid).where(notes_fts.c.title.like(f"%{search}%"))
+                query = query.where(Note.id.in_(matches))
+            else:
+                query = query.where(Note.title.ilike(f"%{search}%"))
         
-        notes = query.order_by(Note.created_at.desc()).offset(skip).limit(limit).all()
+        rows = await self.db.execute(query.order_by(Note.created_at.desc()).offset(skip).limit(limit))
         
-        result = []
-        for note in notes:
-            summary_count = self.db.query(Summary).filter(Summary.note_id == note.id).count()
-            result.append(NoteListResponse(
-                id=note.id,
-                title=note.title,
-                source_type=note.source_type.value,
-                char_count=note.char_count,
-                created_at=note.created_at,
-                summary_count=summary_count,
-                content_preview=note.content[:200] + "..." if len(note.content) > 200 else note.content
-            ))
-        return result
+        return NoteListAdapter.validate_python([
+            {
+                "id": row.id,
+                "title": row.title,
+                "source_type": row.source_type.value,
+                "char_count": row.char_count,
+                "created_at": row.created_at,
+                "summary_count": row.summary_count,
+                "content_preview": row.preview[:200] + "..." if len(row.preview) > 200 else row.preview
+            }
+            for row in rows
+        ])
     
-    def update_note(self, note_id: int, data: NoteUpdate) -> Optional[Note]:
-        note = self.db.query(Note).filter(Note.id == note_id).first()
+    async def update_note(self, note_id: int, data: NoteUpdate) -> Optional[Note]:
+        note = await self._get_with_count(note_id)
         if not note:
             return None
         
@@ -72,15 +110,14 @@ class NoteService:
             note.char_count = len(data.content)
             note.content_hash = self._compute_hash(data.content)
         
-        self.db.commit()
-        self.db.refresh(note)
-        note.summary_count = self.db.query(Summary).filter(Summary.note_id == note_id).count()
+        await self.db.commit()
         return note
     
-    def delete_note(self, note_id: int) -> bool:
-        note = self.db.query(Note).filter(Note.id == note_id).first()
+    async def delete_note(self, note_id: int) -> bool:
+        # Deleting never needs the note body
+        note = await self.db.get(Note, note_id, options=[defer(Note.content)])
         if not note:
             return False
-        self.db.delete(note)
-        self.db.commit()
+        await self.db.delete(note)
+        await self.db.commit()
         return True
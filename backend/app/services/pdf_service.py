@@ -1,62 +1,83 @@
 """PDF text extraction service."""
 
-from typing import Optional
+from typing import Optional, Union, BinaryIO
+import io
 import re
 
+from ..config import settings
+
+try:
+    import fitz as _fitz
+except ImportError:
+    _fitz = None
+
+try:
+    import pdfplumber as _pdfplumber
+except ImportError:
+    _pdfplumber = None
+
+_RE_MULTI_NEWLINE = re.compile(r'\n{3,}')
+_RE_PAGE_NUMBER = re.compile(r'\n\s*\d+\s*\n')
+_RE_PAGE_LABEL = re.compile(r'\n\s*Page \d+\s*\n', re.IGNORECASE)
+_RE_HYPHENATED = re.compile(r'(\w)-\n(\w)')
+_RE_SPACES = re.compile(r'[ \t]+')
+
 
 class PDFService:
     def __init__(self):
-        self._extractor = None
-        try:
-            import pdfplumber
+        if settings.pdf_backend:
+            self._extractor = settings.pdf_backend.lower()
+        elif _fitz is not None:
+            self._extractor = "pymupdf"
+        elif _pdfplumber is not None:
             self._extractor = "pdfplumber"
-        except ImportError:
-            pass
-        if not self._extractor:
-            try:
-                import fitz
-                self._extractor = "pymupdf"
-            except ImportError:
-                pass
+        else:
+            self._extractor = None
     
-    def extract_text(self, pdf_content: bytes) -> str:
-        if self._extractor == "pymupdf":
+    def extract_text(self, pdf_content: Union[bytes, BinaryIO]) -> str:
+        if self._extractor == "pymupdf" and _fitz is not None:
             return self._extract_with_pymupdf(pdf_content)
-        elif self._extractor == "pdfplumber":
+        elif self._extractor == "pdfplumber" and _pdfplumber is not None:
             return self._extract_with_pdfplumber(pdf_content)
-        raise ValueError("No PDF library available. Install pymupdf or pdfplumber")
+        raise ValueError("No PDF library available. Install pdfplumber (or pymupdf)")
     
-    def _extract_with_pymupdf(self, pdf_content: bytes) -> str:
-        import fitz
+    def _extract_with_pymupdf(self, pdf_content: Union[bytes, BinaryIO]) -> str:
+        if not isinstance(pdf_content, (bytes, bytearray)):
+            pdf_content = pdf_content.read()
         text_parts = []
-        doc = fitz.open(stream=pdf_content, filetype="pdf")
+        doc = _fitz.open(stream=pdf_content, filetype="pdf")
         try:
-            for page_num in range(len(doc)):
-                text = doc[page_num].get_text("text")
+            for page in doc:
+                # No fonts means nothing can draw text (e.g. scanned pages), so skip decoding the content stream
+                if not page.get_fonts():
+                    continue
+                text = page.get_text("text")
                 if text.strip():
                     text_parts.append(text)
         finally:
             doc.close()
         return self._clean_text("\n\n".join(text_parts))
     
-    def _extract_with_pdfplumber(self, pdf_content: bytes) -> str:
-        import pdfplumber
-        import io
+    def _extract_with_pdfplumber(self, pdf_content: Union[bytes, BinaryIO]) -> str:
+        if isinstance(pdf_content, (bytes, bytearray)):
+            pdf_content = io.BytesIO(pdf_content)
         text_parts = []
-        with pdfplumber.open(io.BytesIO(pdf_content)) as pdf:
+        with _pdfplumber.open(pdf_content) as pdf:
             for page in pdf.pages:
+                if not page.chars:
+                    continue
                 text = page.extract_text()
                 if text and text.strip():
                     text_parts.append(text)
         return self._clean_text("\n\n".join(text_parts))
     
     def _clean_text(self, text: str) -> str:
-        text = re.sub(r'\n{3,}', '\n\n', text)
-        text = re.sub(r'\n\s*\d+\s*\n', '\n', text)
-        text = re.sub(r'\n\s*Page \d+\s*\n', '\n', text, flags=re.IGNORECASE)
-        text = re.sub(r'(\w)-\n(\w)', r'\1\2', text)
-        text = re.sub(r'[ \t]+', ' ', text)
-        text = re.sub(r' *\n *', '\n', text)
+        text = _RE_MULTI_NEWLINE.sub('\n\n', text)
+        text = _RE_PAGE_NUMBER.sub('\n', text)
+        text = _RE_PAGE_LABEL.sub('\n', text)
+        text = _RE_HYPHENATED.sub(r'\1\2', text)
+        # Spaces around newlines are left to the per-line strip below
+        text = _RE_SPACES.sub(' ', text)
         lines = [line.strip() for line in text.split('\n')]
         return '\n'.join(lines).strip()
     
@@ -4,12 +4,54 @@ AI Summarizer Module - Unified interface for text summarization.
 
 from abc import ABC, abstractmethod
 from typing import Dict, Any, Optional, List
+from functools import lru_cache
+from bisect import bisect_right
+from concurrent.futures import ThreadPoolExecutor
 import asyncio
-from ..config import get_settings
+import logging
+import os
+import threading
+from ..config import settings
+
+logger = logging.getLogger(__name__)
 
 # Supported models
 GROQ_DEFAULT_MODEL = "openai/gpt-oss-120b"
 HUGGINGFACE_DEFAULT_MODEL = "facebook/bart-large-cnn"
+HF_BATCH_SIZE = 8
+MAX_CONCURRENT_CHUNK_CALLS = 8
+
+PROMPT_TEMPLATES = {
+    "summary": "Summarize the following text in {length}. {style}\n\nCapture the main points concisely:",
+    "key_points": "Extract the key points from the following text as a bulleted list ({length} worth of points). {style}:",
+    "flashcards": "Create study flashcards (Q&A format) from the following text ({length} worth of cards). {style}:",
+}
+# Auto length by text size: AUTO_LENGTHS[i] applies below AUTO_LENGTH_BOUNDS[i] characters
+AUTO_LENGTH_BOUNDS = (500, 2000, 5000, 15000)
+AUTO_LENGTHS = (("2-3 lines", 100), ("4-6 lines", 200), ("6-10 lines", 350), ("10-15 lines", 500), ("15-20 lines", 700))
+NEWLINE_TO_SPACE = str.maketrans('\n', ' ')
+
+# Dedicated inference thread: keeps BART off the request threadpool and serializes the pipeline
+_HF_EXECUTOR = ThreadPoolExecutor(max_workers=1, thread_name_prefix="hf-inference")
+
+
+@lru_cache(maxsize=1)
+def get_http_client():
+    """Per-worker HTTP/2 client shared by the chat API SDKs, so TLS connections are reused."""
+    import httpx
+    return httpx.AsyncClient(
+        http2=True,
+        limits=httpx.Limits(max_connections=100, max_keepalive_connections=50),
+        timeout=60
+    )
+
+
+async def close_http_client():
+    if get_http_client.cache_info().currsize:
+        await get_http_client().aclose()
+        get_http_client.cache_clear()
+        # Cached summarizers hold SDK clients bound to the closed transport
+        SummarizerFactory._create.cache_clear()
 
 
 class BaseSummarizer(ABC):
@@ -32,38 +74,36 @@ class BaseSummarizer(ABC):
         if len(text) <= chunk_size:
             return [text]
 
-        chunks, current = [], ""
-        for sentence in text.replace('\n', ' ').split('. '):
-            if len(sentence) > chunk_size:
-                if current:
-                    chunks.append(current.strip())
-                    current = ""
-                for i in range(0, len(sentence), chunk_size):
-                    chunks.append(sentence[i:i + chunk_size].strip())
-            elif len(current) + len(sentence) + 2 <= chunk_size:
-                current += sentence + ". "
-            else:
-                if current:
-                    chunks.append(current.strip())
-                current = sentence + ". "
-        if current:
-            chunks.append(current.strip())
+        # Track offsets into one normalized copy and only slice when a chunk is emitted
+        text = text.translate(NEWLINE_TO_SPACE)
+        chunks, chunk_start, pos, end_of_text = [], 0, 0, len(text)
+
+        def emit(piece: str):
+            piece = piece.strip()
+            if piece:
+                chunks.append(piece)
+
+        while pos < end_of_text:
+            sentence_end = text.find('. ', pos)
+            if sentence_end == -1:
+                sentence_end = end_of_text
+            if sentence_end - pos > chunk_size:
+                emit(text[chunk_start:pos])
+                for i in range(pos, sentence_end, chunk_size):
+                    emit(text[i:min(i + chunk_size, sentence_end)])
+                chunk_start = sentence_end + 2
+            elif sentence_end + 2 - chunk_start > chunk_size:
+                emit(text[chunk_start:pos])
+                chunk_start = pos
+            pos = sentence_end + 2
+        emit(text[chunk_start:])
         return chunks
     
     def _get_length_instruction(self, line_count: Optional[int], text_length: int) -> tuple[str, int]:
         """Get length instruction and max tokens based on line count or auto-detect."""
         if line_count is None:
             # Auto-detect based on content length
-            if text_length < 500:
-                return "2-3 lines", 100
-            elif text_length < 2000:
-                return "4-6 lines", 200
-            elif text_length < 5000:
-                return "6-10 lines", 350
-            elif text_length < 15000:
-                return "10-15 lines", 500
-            else:
-                return "15-20 lines", 700
+            return AUTO_LENGTHS[bisect_right(AUTO_LENGTH_BOUNDS, text_length)]
         else:
             # User specified line count
             tokens = max(50, line_count * 30)  # ~30 tokens per line
@@ -74,22 +114,17 @@ class BaseSummarizer(ABC):
         """Generate prompt based on summary type, length, and style."""
         length_instruction, max_tokens = self._get_length_instruction(line_count, text_length)
         style_instruction = self.STYLE_CONFIG.get(style, self.STYLE_CONFIG["best_fit"])
-        
-        prompts = {
-            "summary": f"Summarize the following text in {length_instruction}. {style_instruction}\n\nCapture the main points concisely:",
-            "key_points": f"Extract the key points from the following text as a bulleted list ({length_instruction} worth of points). {style_instruction}:",
-            "flashcards": f"Create study flashcards (Q&A format) from the following text ({length_instruction} worth of cards). {style_instruction}:"
-        }
-        return prompts.get(summary_type, prompts["summary"]), max_tokens
+        template = PROMPT_TEMPLATES.get(summary_type, PROMPT_TEMPLATES["summary"])
+        return template.format(length=length_instruction, style=style_instruction), max_tokens
 
 
 class ChatAPISummarizer(BaseSummarizer):
     """Unified summarizer for OpenAI-compatible chat APIs (OpenAI, Groq)."""
     
     def __init__(self, provider: str):
-        settings = get_settings()
         self.provider = provider
         self.chunk_size = settings.chunk_size
+        self._client = None
         
         if provider == "openai":
             self.api_key = settings.openai_api_key
@@ -99,12 +134,14 @@ class ChatAPISummarizer(BaseSummarizer):
             self.model = GROQ_DEFAULT_MODEL
     
     def _get_client(self):
-        if self.provider == "openai":
-            from openai import AsyncOpenAI
-            return AsyncOpenAI(api_key=self.api_key)
-        else:
-            from groq import AsyncGroq
-            return AsyncGroq(api_key=self.api_key)
+        if self._client is None:
+            if self.provider == "openai":
+                from openai import AsyncOpenAI
+                self._client = AsyncOpenAI(api_key=self.api_key, http_client=get_http_client())
+            else:
+                from groq import AsyncGroq
+                self._client = AsyncGroq(api_key=self.api_key, http_client=get_http_client())
+        return self._client
     
     async def _call_api(self, client, messages: list, max_tokens: int) -> tuple:
         response = await client.chat.completions.create(
@@ -127,13 +164,17 @@ class ChatAPISummarizer(BaseSummarizer):
         system_msg = {"role": "system", "content": f"You are a helpful assistant that creates clear, accurate summaries. {self.STYLE_CONFIG.get(style, '')}"}
         
         if len(chunks) > 1:
-            summaries, total_tokens = [], 0
-            for chunk in chunks:
-                content, tokens = await self._call_api(client, [system_msg, {"role": "user", "content": f"{prompt}\n\n{chunk}"}], max_tokens)
-                summaries.append(content)
-                total_tokens += tokens
+            # Chunks are independent, so summarize them concurrently (bounded to stay under provider rate limits)
+            semaphore = asyncio.Semaphore(MAX_CONCURRENT_CHUNK_CALLS)
             
-            combined = "\n\n".join(summaries)
+            async def summarize_chunk(chunk: str) -> tuple:
+                async with semaphore:
+                    return await self._call_api(client, [system_msg, {"role": "user", "content": f"{prompt}\n\n{chunk}"}], max_tokens)
+            
+            results = await asyncio.gather(*(summarize_chunk(chunk) for chunk in chunks))
+            total_tokens = sum(tokens for _, tokens in results)
+            
+            combined = "\n\n".join(content for content, _ in results)
             length_instruction, _ = self._get_length_instruction(line_count, len(text))
             summary, tokens = await self._call_api(client, [
                 system_msg,
@@ -151,20 +192,40 @@ class HuggingFaceSummarizer(BaseSummarizer):
     
     _pipeline = None
     _model_name = None
+    _pipeline_lock = threading.Lock()
     
     def __init__(self):
         self.model_name = HUGGINGFACE_DEFAULT_MODEL
     
+    @staticmethod
+    def _device_kwargs() -> Dict[str, Any]:
+        """FP16 on CUDA, BF16 on CPUs with AMX, otherwise the FP32 CPU default."""
+        import torch
+        if torch.cuda.is_available():
+            return {"device": 0, "torch_dtype": torch.float16}
+        try:
+            with open("/proc/cpuinfo") as f:
+                has_amx = "amx_bf16" in f.read()
+        except OSError:
+            has_amx = False
+        if has_amx:
+            return {"device": -1, "torch_dtype": torch.bfloat16}
+        return {"device": -1}
+    
     def _get_pipeline(self):
-        if HuggingFaceSummarizer._pipeline is None or HuggingFaceSummarizer._model_name != self.model_name:
-            from transformers import pipeline
-            print(f"🔄 Loading model: {self.model_name}")
-            HuggingFaceSummarizer._pipeline = pipeline("summarization", model=self.model_name, device=-1)
-            HuggingFaceSummarizer._model_name = self.model_name
+        with HuggingFaceSummarizer._pipeline_lock:
+            if HuggingFaceSummarizer._pipeline is None or HuggingFaceSummarizer._model_name != self.model_name:
+                import torch
+                from transformers import pipeline
+                logger.info("Loading model: %s", self.model_name)
+                # The single hf-inference thread should use every core for intra-op parallelism
+                torch.set_num_threads(os.cpu_count() or 1)
+                HuggingFaceSummarizer._pipeline = pipeline("summarization", model=self.model_name, **self._device_kwargs())
+                HuggingFaceSummarizer._model_name = self.model_name
         return HuggingFaceSummarizer._pipeline
     
-    async def summarize(self, text: str, line_count: Optional[int] = None, 
-                       summary_type: str = "summary", style: str = "best_fit") -> Dict[str, Any]:
+    def summarize_sync(self, text: str, line_count: Optional[int] = None) -> Dict[str, Any]:
+        """Run the whole chunked inference on the calling thread."""
         # Map line count to length params (HuggingFace doesn't support style)
         if line_count is None:
             max_length, min_length = 130, 50
@@ -173,18 +234,20 @@ class HuggingFaceSummarizer(BaseSummarizer):
             min_length = max(10, line_count * 10)
         
         chunks = self._chunk_text(text, 800)
-        
-        loop = asyncio.get_event_loop()
-        summaries = []
-        for chunk in chunks:
-            result = await loop.run_in_executor(
-                None,
-                lambda c=chunk: self._get_pipeline()(c, max_length=max_length, min_length=min_length, do_sample=False, truncation=True)
-            )
-            summaries.append(result[0]["summary_text"])
+        # One pipeline call lets transformers batch the chunks through the model
+        results = self._get_pipeline()(
+            chunks, max_length=max_length, min_length=min_length, do_sample=False, truncation=True,
+            batch_size=min(HF_BATCH_SIZE, len(chunks))
+        )
+        summaries = [r["summary_text"] for r in results]
         
         summary = " ".join(summaries) if len(summaries) > 1 else summaries[0]
         return {"summary": summary, "provider": "huggingface", "model": self.model_name, "tokens": None}
+    
+    async def summarize(self, text: str, line_count: Optional[int] = None, 
+                       summary_type: str = "summary", style: str = "best_fit") -> Dict[str, Any]:
+        # to_thread would use the default pool; the dedicated executor keeps inference serialized
+        return await asyncio.get_running_loop().run_in_executor(_HF_EXECUTOR, self.summarize_sync, text, line_count)
 
 
 class MockSummarizer(BaseSummarizer):
@@ -203,9 +266,12 @@ class SummarizerFactory:
     
     @staticmethod
     def get_summarizer(provider: Optional[str] = None) -> BaseSummarizer:
-        settings = get_settings()
-        provider = provider or settings.ai_provider
-        
+        return SummarizerFactory._create(provider or settings.ai_provider)
+    
+    @staticmethod
+    @lru_cache(maxsize=8)
+    def _create(provider: str) -> BaseSummarizer:
+        """One shared instance per resolved provider."""
         providers = {
             "openai": lambda: ChatAPISummarizer("openai"),
             "groq": lambda: ChatAPISummarizer("groq"),
@@ -1,6 +1,7 @@
 """Summary service for AI summarization."""
 
-from sqlalchemy.orm import Session
+from sqlalchemy import select, insert, literal, exists, func
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional, List
 import time
 
@@ -9,16 +10,16 @@ from .summarizer import SummarizerFactory
 
 
 class SummaryService:
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.db = db
         self.summarizer = SummarizerFactory.get_summarizer()
     
-    def _get_existing_summary(self, note_id: int, length: str, type: str, style: str) -> Optional[Summary]:
-        return self.db.query(Summary).filter(
+    async def _get_existing_summary(self, note_id: int, length: str, type: str, style: str) -> Optional[Summary]:
+        return await self.db.scalar(select(Summary).where(
             Summary.note_id == note_id,
             Summary.summary_length == length,
             Summary.summary_type == type
-        ).order_by(Summary.created_at.desc()).first()
+        ).order_by(Summary.created_at.desc()).limit(1))
     
     async def generate_summary(
         self, 
@@ -33,7 +34,7 @@ class SummaryService:
         length_str = str(line_count) if line_count else "auto"
         
         if not force_regenerate:
-            existing = self._get_existing_summary(note_id, length_str, summary_type, summary_style)
+            existing = await self._get_existing_summary(note_id, length_str, summary_type, summary_style)
             if existing:
                 return existing
         
@@ -49,7 +50,7 @@ class SummaryService:
         summary_len = len(result["summary"])
         compression_ratio = len(content) / summary_len if summary_len > 0 else 0
         
-        summary = Summary(
+        values = dict(
             note_id=note_id,
             content=result["summary"],
             summary_type=summary_type,
@@ -61,22 +62,35 @@ class SummaryService:
             compression_ratio=round(compression_ratio, 2)
         )
         
-        self.db.add(summary)
-        self.db.commit()
-        self.db.refresh(summary)
-        return summary
+        if force_regenerate:
+            stmt = insert(Summary).values(**values)
+        else:
+            # Insert only if no concurrent request stored a matching summary while this one was generating.
+            # SQLite serializes writers; PostgreSQL needs a per-note lock (released at commit) to make the check atomic.
+            if self.db.bind.dialect.name == "postgresql":
+                await self.db.execute(select(func.pg_advisory_xact_lock(note_id)))
+            duplicate = select(Summary.id).where(
+                Summary.note_id == note_id,
+                Summary.summary_length == length_str,
+                Summary.summary_type == summary_type
+            )
+            row = select(*(literal(value, Summary.__table__.c[name].type) for name, value in values.items()))
+            stmt = insert(Summary).from_select(list(values), row.where(~exists(duplicate)))
+        summary = await self.db.scalar(stmt.returning(Summary))
+        await self.db.commit()
+        return summary or await self._get_existing_summary(note_id, length_str, summary_type, summary_style)
     
-    def get_summaries_for_note(self, note_id: int) -> List[Summary]:
-        return self.db.query(Summary).filter(Summary.note_id == note_id).order_by(Summary.created_at.desc()).all()
+    async def get_summaries_for_note(self, note_id: int) -> List[Summary]:
+        return list(await self.db.scalars(select(Summary).where(Summary.note_id == note_id).order_by(Summary.created_at.desc())))
     
-    def get_summary(self, summary_id: int) -> Optional[Summary]:
-        return self.db.query(Summary).filter(Summary.id == summary_id).first()
+    async def get_summary(self, summary_id: int) -> Optional[Summary]:
+        return await self.db.get(Summary, summary_id)
     
-    def delete_summary(self, summary_id: int) -> bool:
-        summary = self.db.query(Summary).filter(Summary.id == summary_id).first()
+    async def delete_summary(self, summary_id: int) -> bool:
+        summary = await self.db.get(Summary, summary_id)
         if not summary:
             return False
-        self.db.delete(summary)
-        self.db.commit()
+        await self.db.delete(summary)
+        await self.db.commit()
         return True
 
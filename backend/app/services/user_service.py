@@ -1,39 +1,44 @@
 """User service."""
 
-from sqlalchemy.orm import Session
+from sqlalchemy import select, null
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional
 import uuid
 
+from ..database import guest_id_default_ready
 from ..models.user import User
 from ..schemas.user import UserCreate
 
 
 class UserService:
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.db = db
     
-    def create_user(self, user_data: UserCreate) -> User:
-        guest_id = str(uuid.uuid4()) if user_data.is_guest else None
+    async def create_user(self, user_data: UserCreate) -> User:
         user = User(
-            guest_id=guest_id,
             email=user_data.email if hasattr(user_data, 'email') else None,
             display_name=user_data.display_name,
-            is_guest=user_data.is_guest
+            is_guest=user_data.is_guest,
+            updated_at=None  # set explicitly so the flush has nothing left to post-fetch
         )
+        if not user_data.is_guest:
+            user.guest_id = null()  # a plain None would be omitted and let the DB default fill it
+        elif not guest_id_default_ready():
+            # Only PostgreSQL gets a gen_random_uuid() column default, returned from the INSERT
+            user.guest_id = str(uuid.uuid4())
         self.db.add(user)
-        self.db.commit()
-        self.db.refresh(user)
+        await self.db.commit()
         return user
     
-    def get_by_id(self, user_id: int) -> Optional[User]:
-        return self.db.query(User).filter(User.id == user_id).first()
+    async def get_by_id(self, user_id: int) -> Optional[User]:
+        return await self.db.get(User, user_id)
     
-    def get_by_guest_id(self, guest_id: str) -> Optional[User]:
-        return self.db.query(User).filter(User.guest_id == guest_id).first()
+    async def get_by_guest_id(self, guest_id: str) -> Optional[User]:
+        return await self.db.scalar(select(User).where(User.guest_id == guest_id))
     
-    def get_or_create_guest(self, guest_id: Optional[str] = None) -> User:
+    async def get_or_create_guest(self, guest_id: Optional[str] = None) -> User:
         if guest_id:
-            user = self.get_by_guest_id(guest_id)
+            user = await self.get_by_guest_id(guest_id)
             if user:
                 return user
-        return self.create_user(UserCreate(is_guest=True))
+        return await self.create_user(UserCreate(is_guest=True))